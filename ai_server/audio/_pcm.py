@@ -0,0 +1,31 @@
+"""
+PCM post-processing helpers for the audio pipeline.
+
+Everything here operates on int16 sample arrays and is vectorized with
+numpy, keeping per-sample work out of the Python interpreter loop.
+"""
+import numpy as np
+
+
+def apply_fade(pcm: np.ndarray, fade_samples: int) -> np.ndarray:
+    """
+    Apply a linear fade-in and fade-out to an int16 PCM array in place.
+
+    Softens the clicks Piper can leave at utterance boundaries. Fades
+    longer than half the signal are clamped so the ramps never overlap.
+
+    Args:
+        pcm: Writable int16 sample array (modified in place)
+        fade_samples: Length of each ramp in samples
+
+    Returns:
+        The same array, for chaining
+    """
+    n = min(fade_samples, len(pcm) // 2)
+    if n <= 0:
+        return pcm
+
+    ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+    pcm[:n] = (pcm[:n] * ramp).astype(np.int16)
+    pcm[-n:] = (pcm[-n:] * ramp[::-1]).astype(np.int16)
+    return pcm
@@ -3,14 +3,85 @@ Audio synthesis module using Piper TTS.
 """
 import logging
 import asyncio
-import io
-import wave
+import atexit
+import functools
+import os
+import struct
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from pathlib import Path
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# One process-wide pool for blocking synthesis work. Per-instance pools
+# leak threads across reloads and oversubscribe the CPU when several
+# voices are loaded; sharing caps total synthesis concurrency.
+_SHARED_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1),
+    thread_name_prefix="piper",
+)
+atexit.register(_SHARED_EXECUTOR.shutdown, wait=False)
+
+
+# Standard 44-byte RIFF/WAVE header for 16-bit mono PCM. Packing it in one
+# shot avoids the wave module's multiple small writes and seek-back pass.
+_WAV_HEADER_FMT = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+
+def _wav_header(sample_rate: int, data_size: int) -> bytes:
+    """Pack a WAV header for 16-bit mono PCM at the given sample rate."""
+    return _WAV_HEADER_FMT.pack(
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b'data', data_size,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _voice_model_exists(path: str) -> bool:
+    """
+    Check whether a voice model file exists, caching per path.
+
+    Voice models never appear or vanish mid-process, so repeated
+    Synthesizer loads (hot reload, multi-voice) skip the stat syscall.
+    Tests can reset via _voice_model_exists.cache_clear().
+    """
+    return Path(path).exists()
+
+
+def _resample_pcm(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    Resample int16 PCM samples between rates via linear interpolation.
+
+    Good enough for short TTS phrases; avoids pulling scipy in for a
+    polyphase filter the voice pipeline does not otherwise need.
+    """
+    n_out = int(len(samples) * dst_rate / src_rate)
+    if n_out == 0:
+        return np.empty(0, dtype=np.int16)
+
+    positions = np.linspace(0, len(samples) - 1, n_out)
+    resampled = np.interp(positions, np.arange(len(samples)),
+                          samples.astype(np.float32))
+    return resampled.astype(np.int16)
+
+
+def _wav_header_streaming(sample_rate: int) -> bytes:
+    """Pack a WAV header with unknown (streaming) data size."""
+    return _WAV_HEADER_FMT.pack(
+        b'RIFF', 0xFFFFFFFF, b'WAVE',
+        b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b'data', 0xFFFFFFFF,
+    )
+
+
+# Built once at import time; empty-text synthesis always yields the same
+# 44-byte container (mono, 16-bit, 22050 Hz, zero frames), so there is
+# no reason to rebuild it per call.
+_SILENT_WAV_BYTES: bytes = _wav_header(22050, 0)
+
 
 class Synthesizer:
     """
@@ -24,13 +95,51 @@ class Synthesizer:
         self,
         voice_model: str = "ai_server/audio/voices/en_GB-alan-medium.onnx",
         speaker_id: Optional[int] = None,
+        use_cuda: bool = False,
+        quantize: bool = False,
+        output_sample_rate: Optional[int] = None,
+        fade_ms: int = 0,
     ):
         self.voice_model = voice_model
         self.speaker_id = speaker_id
+        self.use_cuda = use_cuda
+        self.quantize = quantize
+        # Linear fade-in/out applied to each utterance; 0 disables it.
+        self.fade_ms = fade_ms
+        # None keeps the voice's native rate (22050 Hz for most Piper
+        # voices); 16000 cuts ~27% off WAV size for bandwidth-bound clients.
+        self.output_sample_rate = output_sample_rate
         self.voice = None
 
-        # Thread pool for blocking synthesis operations
-        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="piper")
+    def _maybe_quantize(self, path: str) -> str:
+        """
+        Dynamic-quantize the ONNX model to INT8 for CPU inference.
+
+        The quantized file is written next to the source model with an
+        .int8.onnx suffix and reused on later loads as long as it is
+        newer than the source. Returns the path to use for the session.
+        """
+        src = Path(path)
+        quant_path = src.with_name(src.stem + ".int8.onnx")
+
+        if quant_path.exists() and quant_path.stat().st_mtime >= src.stat().st_mtime:
+            return str(quant_path)
+
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info(f"Quantizing voice model to INT8: {quant_path}")
+        quantize_dynamic(
+            str(src),
+            str(quant_path),
+            weight_type=QuantType.QInt8,
+            op_types_to_quantize=["MatMul", "Gemm", "Conv"],
+        )
+        return str(quant_path)
+
+    @property
+    def _executor(self) -> ThreadPoolExecutor:
+        """Thread pool for blocking synthesis operations (process-wide)."""
+        return _SHARED_EXECUTOR
 
     def load_model(self):
         """
@@ -39,9 +148,9 @@ class Synthesizer:
         """
         logger.info(f"Loading Piper voice model: {self.voice_model}")
 
-        # Check if model file exists
+        # Check if model file exists (cached per path)
         model_path = Path(self.voice_model)
-        if not model_path.exists():
+        if not _voice_model_exists(self.voice_model):
             raise FileNotFoundError(
                 f"Piper voice model not found at: {self.voice_model}\n"
                 f"Please download the voice model. See ai_server/audio/voices/README.md"
@@ -49,28 +158,87 @@ class Synthesizer:
 
         try:
             from piper import PiperVoice
+            import onnxruntime as ort
+
             self.voice = PiperVoice.load(str(model_path), use_cuda=False)
+
+            # PiperVoice resolves its config from the FP32 model path;
+            # the session itself can run the INT8 variant when enabled.
+            session_path = str(model_path)
+            if self.quantize:
+                session_path = self._maybe_quantize(session_path)
+
+            # Rebuild the ONNX session with production-grade options:
+            # full graph optimization (node fusion) and an explicit
+            # intra-op thread count instead of ORT's conservative defaults.
+            so = ort.SessionOptions()
+            so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            so.intra_op_num_threads = int(
+                os.environ.get("ALFRED_ORT_THREADS", os.cpu_count() or 1)
+            )
+            so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+
+            if self.use_cuda:
+                # ORT defaults to EXHAUSTIVE cuDNN algo search, which
+                # re-tunes kernels per input shape and is 5-100x slower
+                # for short TTS inputs. DEFAULT skips the tuning pass.
+                providers = [
+                    (
+                        "CUDAExecutionProvider",
+                        {
+                            "cudnn_conv_algo_search": "DEFAULT",
+                            "do_copy_in_default_stream": True,
+                        },
+                    ),
+                    "CPUExecutionProvider",
+                ]
+            else:
+                providers = ["CPUExecutionProvider"]
+
+            self.voice.session = ort.InferenceSession(
+                session_path,
+                sess_options=so,
+                providers=providers,
+            )
+
+            # First inference pays one-time costs (kernel selection,
+            # arena allocation, constant folding); a throwaway run moves
+            # them out of the first user request. Never fail the load.
+            try:
+                for _ in self.voice.synthesize(" "):
+                    break
+            except Exception:
+                logger.debug("Voice model warmup skipped", exc_info=True)
+
             logger.info("Piper voice model loaded successfully")
         except ImportError:
             raise ImportError(
                 "piper-tts not installed. Install with: pip install piper-tts"
             )
 
-    def synthesize_sync(self, text: str) -> bytes:
+    def synthesize_sync(self, text: str, zero_copy: bool = False) -> bytes:
         """
         Synthesize text to speech.
         BLOCKING method - run in executor.
 
+        Args:
+            text: Text to synthesize
+            zero_copy: Return a memoryview over the assembly buffer
+                instead of copying it into an immutable bytes object.
+                Useful for handlers that write the WAV straight to a
+                socket and drop it.
+
         Returns:
-            WAV audio data as bytes
+            WAV audio data as bytes (or a memoryview when zero_copy)
         """
         if not self.voice:
             raise RuntimeError("Synthesizer voice model not loaded")
 
-        if not text or not text.strip():
+        stripped = text.strip() if text else ''
+        if not stripped:
             logger.warning("Empty text provided for synthesis")
             # Return silent WAV (empty audio)
-            return self._create_silent_wav()
+            return _SILENT_WAV_BYTES
 
         # Synthesize audio using Piper
         # PiperVoice.synthesize() returns a generator of AudioChunk objects
@@ -80,42 +248,123 @@ class Synthesizer:
         if self.speaker_id is not None:
             syn_config = SynthesisConfig(speaker_id=self.speaker_id)
 
+        # int16 arrays are the canonical PCM representation here: the
+        # resample and fade stages below all want sample arrays, and
+        # keeping them as arrays means exactly one bytes copy at the end.
         audio_chunks = []
         sample_rate = None
 
-        for chunk in self.voice.synthesize(text, syn_config=syn_config):
-            # Extract PCM audio bytes from the chunk
-            audio_chunks.append(chunk.audio_int16_bytes)
+        for chunk in self.voice.synthesize(stripped, syn_config=syn_config):
+            # View the chunk's PCM bytes as int16 samples (no copy)
+            audio_chunks.append(
+                np.frombuffer(chunk.audio_int16_bytes, dtype=np.int16)
+            )
             if sample_rate is None:
                 sample_rate = chunk.sample_rate
 
-        # Concatenate all audio bytes
-        pcm_audio = b''.join(audio_chunks)
+        sample_rate = sample_rate or 22050
+        if audio_chunks:
+            pcm = np.concatenate(audio_chunks)
+        else:
+            pcm = np.empty(0, dtype=np.int16)
 
-        # Wrap PCM in WAV format
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, 'wb') as wav_file:
-            wav_file.setnchannels(1)  # Mono
-            wav_file.setsampwidth(2)  # 16-bit
-            wav_file.setframerate(sample_rate or 22050)  # Use voice's sample rate
-            wav_file.writeframes(pcm_audio)
+        if self.output_sample_rate and self.output_sample_rate != sample_rate:
+            pcm = _resample_pcm(pcm, sample_rate, self.output_sample_rate)
+            sample_rate = self.output_sample_rate
 
-        wav_buffer.seek(0)
-        return wav_buffer.read()
+        if self.fade_ms:
+            from ai_server.audio._pcm import apply_fade
 
-    def _create_silent_wav(self) -> bytes:
+            apply_fade(pcm, sample_rate * self.fade_ms // 1000)
+
+        # Wrap PCM in WAV format: size the buffer exactly once and fill
+        # it with slice assignment — no intermediate BytesIO writes,
+        # size-patching seeks, or growth reallocations.
+        data_size = pcm.nbytes
+        buf = bytearray(44 + data_size)
+        buf[:44] = _wav_header(sample_rate, data_size)
+        buf[44:] = pcm.tobytes()
+
+        if zero_copy:
+            return memoryview(buf)
+        return bytes(buf)
+
+    def synthesize_batch_sync(self, texts: list) -> list:
         """
-        Create a minimal silent WAV file (for empty text).
+        Synthesize several short texts in one go.
+        BLOCKING method - run in executor.
+
+        Keeps the whole batch on one worker thread so callers pay a
+        single dispatch instead of one executor hop per phrase.
+
+        Returns:
+            List of WAV audio data, one bytes object per input text
+        """
+        if not self.voice:
+            raise RuntimeError("Synthesizer voice model not loaded")
+
+        return [self.synthesize_sync(text) for text in texts]
+
+    async def synthesize_batch(self, texts: list) -> list:
         """
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, 'wb') as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(22050)
-            wav_file.writeframes(b'')  # Empty audio
+        Async wrapper for batch synthesis.
 
-        wav_buffer.seek(0)
-        return wav_buffer.read()
+        Args:
+            texts: Texts to synthesize
+
+        Returns:
+            List of WAV audio data as bytes
+        """
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self.synthesize_batch_sync,
+            texts
+        )
+
+    def synthesize_stream_sync(self, text: str):
+        """
+        Synthesize text to speech as a stream of WAV fragments.
+        BLOCKING generator - run in executor.
+
+        Yields the 44-byte WAV header first (with unknown data size, as is
+        conventional for streaming WAV), then each raw PCM chunk as Piper
+        produces it. Peak memory stays O(chunk) instead of O(utterance).
+        """
+        if not self.voice:
+            raise RuntimeError("Synthesizer voice model not loaded")
+
+        stripped = text.strip() if text else ''
+        if not stripped:
+            logger.warning("Empty text provided for synthesis")
+            yield _SILENT_WAV_BYTES
+            return
+
+        from piper.config import SynthesisConfig
+
+        syn_config = None
+        if self.speaker_id is not None:
+            syn_config = SynthesisConfig(speaker_id=self.speaker_id)
+
+        header_sent = False
+        for chunk in self.voice.synthesize(stripped, syn_config=syn_config):
+            if not header_sent:
+                # Total size is unknown up front; 0xFFFFFFFF is the
+                # accepted streaming convention (players read to EOF).
+                yield _wav_header_streaming(chunk.sample_rate or 22050)
+                header_sent = True
+            yield chunk.audio_int16_bytes
+
+        if not header_sent:
+            yield _SILENT_WAV_BYTES
+
+    def _create_silent_wav(self) -> bytes:
+        """
+        Return the precomputed silent WAV file (for empty text).
+        """
+        return _SILENT_WAV_BYTES
 
     async def synthesize(self, text: str) -> bytes:
         """
@@ -127,9 +376,17 @@ class Synthesizer:
         Returns:
             WAV audio data as bytes
         """
+        # Empty input never needs a worker thread; answer from the
+        # precomputed constant without a Future or executor hop. The
+        # stripped text is forwarded so the worker does not strip again.
+        stripped = text.strip() if text else ''
+        if not stripped:
+            logger.warning("Empty text provided for synthesis")
+            return _SILENT_WAV_BYTES
+
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(
             self._executor,
             self.synthesize_sync,
-            text
+            stripped
         )
@@ -17,6 +17,7 @@ Plain text is the *expected* conversation path, not an error.
 Default model: configurable via ALFRED_CORE_MODEL env var.
 """
 import asyncio
+import functools
 import json
 import logging
 from pathlib import Path
@@ -136,6 +137,102 @@ No explanation, no markdown, no extra text — just the corrected JSON object.
 {broken_output}"""
 
 
+@functools.lru_cache(maxsize=16)
+def _format_tools(tools_key: tuple) -> str:
+    """
+    Render the tools block for the prompt.
+
+    The tool registry is effectively static per process, so the JSON dump
+    is memoized on a hashable (name, description) tuple instead of being
+    re-serialized on every request.
+    """
+    return json.dumps([dict(items) for items in tools_key], indent=2)
+
+
+def _tools_cache_key(tools: List[Dict[str, str]]) -> tuple:
+    """Build a hashable cache key from a tool list, preserving key order."""
+    return tuple(tuple(t.items()) for t in tools)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_template(path: str) -> Optional[str]:
+    """
+    Read a prompt template from disk, or None if the file doesn't exist.
+
+    Cached per path so re-instantiating AlfredCore (tests, reloads) never
+    re-reads the same file.
+    """
+    file = Path(path)
+    if file.exists():
+        return file.read_text(encoding="utf-8")
+    return None
+
+
+# Single adapter instance — rebuilding the TypeAdapter per parse is wasteful.
+_DECISION_ADAPTER = TypeAdapter(Union[CallToolDecision, ProposeNewToolDecision])
+
+
+class _SchemaError:
+    """
+    Cached stand-in for a schema-validation failure.
+
+    lru_cache must not cache raised exceptions, so the cached parser returns
+    this marker and _parse_output re-raises it as ValueError on every hit.
+    """
+
+    __slots__ = ("message",)
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_output_cached(
+    cleaned: str,
+) -> Union[str, CallToolDecision, ProposeNewToolDecision, None, "_SchemaError"]:
+    """Pure parse/repair/validate body behind _parse_output. See its docstring."""
+    # Plain text → conversational response (this is the normal path for Q&A)
+    if not cleaned.startswith("{"):
+        return cleaned
+
+    # Starts with '{' → attempt JSON parse
+    try:
+        parsed: Dict[str, Any] = json.loads(cleaned)
+    except json.JSONDecodeError:
+        # Attempt to repair truncated JSON (common with some models)
+        try:
+            parsed = json.loads(cleaned + "}")
+        except json.JSONDecodeError:
+            # Cannot recover — return None to signal retry
+            return None
+
+    # Validate against known tool decision schemas
+    try:
+        return _DECISION_ADAPTER.validate_python(parsed)
+    except Exception as exc:
+        # Valid JSON but doesn't match any tool schema.
+        # Check for conversational JSON fallback (model went off-script but
+        # still output JSON, e.g. {"response": "...", "answer": "..."})
+        fallback_text = (
+            parsed.get("response")
+            or parsed.get("answer")
+            or parsed.get("message")
+            or parsed.get("text")
+            or parsed.get("reply")
+        )
+        if fallback_text and isinstance(fallback_text, str):
+            logger.warning(
+                f"Core returned off-script JSON with keys {list(parsed.keys())!r}"
+                f" — treating as conversational response"
+            )
+            return fallback_text
+
+        return _SchemaError(
+            f"Core returned valid JSON that failed schema validation: {parsed}. "
+            f"Error: {exc}"
+        )
+
+
 class AlfredCore:
     """
     Unified LLM brain — single call that both decides and responds.
@@ -156,9 +253,9 @@ class AlfredCore:
         self.model_name = model
 
         # Load core prompt (fall back to default if file not found)
-        core_file = Path(prompt_path)
-        if core_file.exists():
-            self.prompt_template = core_file.read_text(encoding="utf-8")
+        core_template = _load_template(prompt_path)
+        if core_template is not None:
+            self.prompt_template = core_template
             logger.info(f"Loaded Core prompt from {prompt_path}")
         else:
             self.prompt_template = DEFAULT_CORE_PROMPT
@@ -167,9 +264,9 @@ class AlfredCore:
             )
 
         # Load retry prompt (fall back to default if file not found)
-        retry_file = Path(retry_prompt_path)
-        if retry_file.exists():
-            self.retry_template = retry_file.read_text(encoding="utf-8")
+        retry_template = _load_template(retry_prompt_path)
+        if retry_template is not None:
+            self.retry_template = retry_template
             logger.info(f"Loaded retry prompt from {retry_prompt_path}")
         else:
             self.retry_template = DEFAULT_RETRY_PROMPT
@@ -190,17 +287,19 @@ class AlfredCore:
         conversation_context: Optional[str] = None,
     ) -> str:
         """Render the core prompt with tools and optional conversation context."""
-        tools_json = json.dumps(tools, indent=2)
+        tools_json = _format_tools(_tools_cache_key(tools))
 
         # Inject conversation context before user input if provided.
         # Format matches the existing router/QA convention so session memory
-        # works the same way as before.
+        # works the same way as before. Built with one join so the bytes are
+        # moved once, regardless of how long the context grows.
         if conversation_context:
-            context_section = (
-                f"\n## Recent Conversation:\n{conversation_context}"
-                f"\n\n## Current Request:\n"
-            )
-            user_input_with_context = context_section + user_input.strip()
+            user_input_with_context = "".join((
+                "\n## Recent Conversation:\n",
+                conversation_context,
+                "\n\n## Current Request:\n",
+                user_input.strip(),
+            ))
         else:
             user_input_with_context = user_input.strip()
 
@@ -210,6 +309,16 @@ class AlfredCore:
             user_input=user_input_with_context,
         )
 
+    def _invoke_llm(self, prompt: str) -> str:
+        """
+        Blocking LLM call, isolated as a single seam.
+
+        process() runs this in a thread; tests patch this method directly
+        instead of monkeypatching the global asyncio.to_thread.
+        """
+        raw = self.llm.invoke(prompt)
+        return raw if isinstance(raw, str) else str(raw)
+
     def _render_retry_prompt(self, broken_output: str) -> str:
         """Render the minimal JSON fix-it prompt. No context, no tools."""
         return self.retry_template.format(broken_output=broken_output)
@@ -220,6 +329,14 @@ class AlfredCore:
         """
         Parse raw LLM output into a CoreDecision.
 
+        Parsing is pure given the output string, so results are served from
+        a module-level LRU cache — duplicate LLM outputs (short replies,
+        repeated tool calls) skip the JSON decode and schema validation.
+        Decision-object hits are deep-copied so no two requests ever share
+        a mutable decision instance. One caching side effect: the
+        off-script-JSON warning logs only on the first occurrence of a
+        given output, not on cache hits.
+
         Returns:
             str:                  Plain text conversational response (valid path).
             CallToolDecision:     Validated tool call.
@@ -231,49 +348,16 @@ class AlfredCore:
             ValueError: Output is valid JSON but fails all known schemas and has
                         no conversational fallback key. No retry — surface the error.
         """
-        cleaned = raw_output.strip()
-
-        # Plain text → conversational response (this is the normal path for Q&A)
-        if not cleaned.startswith("{"):
-            return cleaned
-
-        # Starts with '{' → attempt JSON parse
-        try:
-            parsed: Dict[str, Any] = json.loads(cleaned)
-        except json.JSONDecodeError:
-            # Attempt to repair truncated JSON (common with some models)
-            try:
-                parsed = json.loads(cleaned + "}")
-            except json.JSONDecodeError:
-                # Cannot recover — return None to signal retry
-                return None
-
-        # Validate against known tool decision schemas
-        adapter = TypeAdapter(Union[CallToolDecision, ProposeNewToolDecision])
-        try:
-            return adapter.validate_python(parsed)
-        except Exception as exc:
-            # Valid JSON but doesn't match any tool schema.
-            # Check for conversational JSON fallback (model went off-script but
-            # still output JSON, e.g. {"response": "...", "answer": "..."})
-            fallback_text = (
-                parsed.get("response")
-                or parsed.get("answer")
-                or parsed.get("message")
-                or parsed.get("text")
-                or parsed.get("reply")
-            )
-            if fallback_text and isinstance(fallback_text, str):
-                logger.warning(
-                    f"Core returned off-script JSON with keys {list(parsed.keys())!r}"
-                    f" — treating as conversational response"
-                )
-                return fallback_text
-
-            raise ValueError(
-                f"Core returned valid JSON that failed schema validation: {parsed}. "
-                f"Error: {exc}"
-            ) from exc
+        result = _parse_output_cached(raw_output.strip())
+        if isinstance(result, _SchemaError):
+            raise ValueError(result.message)
+        if isinstance(result, (CallToolDecision, ProposeNewToolDecision)):
+            # Hand each caller its own instance: the cache would otherwise
+            # serve one shared mutable decision to every request whose LLM
+            # output repeats, turning any in-place edit into cross-request
+            # contamination.
+            return result.model_copy(deep=True)
+        return result
 
     async def process(
         self,
@@ -307,9 +391,7 @@ class AlfredCore:
         )
 
         # OllamaLLM.invoke() is synchronous — run in thread to avoid blocking
-        raw_output = await asyncio.to_thread(self.llm.invoke, prompt)
-        if not isinstance(raw_output, str):
-            raw_output = str(raw_output)
+        raw_output = await asyncio.to_thread(self._invoke_llm, prompt)
 
         # Save raw output for debugging (non-critical)
         try:
@@ -330,9 +412,7 @@ class AlfredCore:
             )
             retry_prompt = self._render_retry_prompt(raw_output.strip())
 
-            retry_output = await asyncio.to_thread(self.llm.invoke, retry_prompt)
-            if not isinstance(retry_output, str):
-                retry_output = str(retry_output)
+            retry_output = await asyncio.to_thread(self._invoke_llm, retry_prompt)
 
             retry_result = self._parse_output(retry_output)
 
@@ -145,6 +145,8 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down AI Server...")
     if ha_integration:
         await ha_integration._close_session()
+    if session_store:
+        session_store.close()
 
 
 # Create FastAPI app
@@ -152,7 +154,7 @@ app = FastAPI(
     title="Smart Home AI Assistant",
     description="Local-first AI assistant for smart home automation",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -3,6 +3,7 @@ SQLite-based session store for conversation history.
 """
 import sqlite3
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
@@ -11,8 +12,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Bound once — get_history materializes many messages and from_dict is on the
+# serialization hot path; skipping the attribute lookup per call adds up.
+_fromiso = datetime.fromisoformat
 
-@dataclass
+
+@dataclass(slots=True)
 class Message:
     """A single chat message in a session."""
     role: str  # "user" or "assistant"
@@ -35,7 +40,7 @@ class Message:
         return cls(
             role=data["role"],
             content=data["content"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            timestamp=_fromiso(data["timestamp"]),
             metadata=data.get("metadata"),
         )
 
@@ -58,9 +63,37 @@ class SessionMeta:
         }
 
 
+# Module-level SQL so every call reuses the identical string object and
+# sqlite3's per-connection statement cache serves a prepared statement
+# instead of re-parsing the SQL.
+_SQL_SESSION_EXISTS = "SELECT 1 FROM sessions WHERE session_id = ?"
+_SQL_INSERT_SESSION = (
+    "INSERT INTO sessions (session_id, created_at, last_active) VALUES (?, ?, ?)"
+)
+_SQL_INSERT_MESSAGE = (
+    "INSERT INTO messages (session_id, role, content, timestamp, metadata) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_SQL_TOUCH_SESSION = "UPDATE sessions SET last_active = ? WHERE session_id = ?"
+_SQL_SELECT_HISTORY = (
+    "SELECT role, content, timestamp, metadata FROM messages "
+    "WHERE session_id = ? ORDER BY timestamp DESC, id DESC LIMIT ?"
+)
+_SQL_LIST_SESSIONS = (
+    "SELECT s.session_id, s.created_at, s.last_active, COUNT(m.id) as msg_count "
+    "FROM sessions s LEFT JOIN messages m ON s.session_id = m.session_id "
+    "GROUP BY s.session_id ORDER BY s.last_active DESC"
+)
+_SQL_DELETE_SESSION = "DELETE FROM sessions WHERE session_id = ?"
+_SQL_DELETE_EXPIRED = "DELETE FROM sessions WHERE last_active < ?"
+
+
 class SessionStore:
     """SQLite-based storage for conversation sessions."""
 
+    # Max number of (session_id, limit) history results kept in memory.
+    HISTORY_CACHE_SIZE = 128
+
     def __init__(self, db_path: str = ":memory:"):
         """
         Initialize session store.
@@ -69,11 +102,33 @@ class SessionStore:
             db_path: Path to SQLite database file, or ":memory:" for in-memory DB
         """
         self.db_path = db_path
+        # URI filenames (e.g. "file:...?mode=memory&cache=shared") need
+        # uri=True on connect; decide once instead of per operation.
+        self._uri = db_path.startswith("file:")
+        # LRU cache of get_history results keyed by (session_id, limit).
+        # Reads dominate writes (every /execute builds context), so caching
+        # skips the query + row conversion for repeat lookups.
+        self._history_cache: "OrderedDict[tuple, List[Message]]" = OrderedDict()
+        # One persistent connection: keeps sqlite3's prepared-statement
+        # cache warm across calls instead of re-parsing SQL on a fresh
+        # connection per operation. check_same_thread=False because
+        # FastAPI may touch the store from worker threads.
+        self._conn = sqlite3.connect(
+            self.db_path, uri=self._uri, check_same_thread=False
+        )
+        # Enforce the schema's ON DELETE CASCADE and give SQLite a larger
+        # page cache (negative value = KiB).
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.execute("PRAGMA cache_size=-64000")
         self._init_db()
 
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
     def _init_db(self):
         """Initialize database schema."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
 
         # Sessions table
@@ -111,7 +166,6 @@ class SessionStore:
         """)
 
         conn.commit()
-        conn.close()
         logger.info(f"Initialized session store at {self.db_path}")
 
     def create_session(self) -> str:
@@ -124,18 +178,26 @@ class SessionStore:
         session_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat()
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO sessions (session_id, created_at, last_active) VALUES (?, ?, ?)",
-            (session_id, now, now)
-        )
-        conn.commit()
-        conn.close()
+        self._conn.execute(_SQL_INSERT_SESSION, (session_id, now, now))
+        self._conn.commit()
 
         logger.info(f"Created session {session_id}")
         return session_id
 
+    def _check_session(self, session_id: str) -> None:
+        """Raise ValueError if the session doesn't exist."""
+        cursor = self._conn.execute(_SQL_SESSION_EXISTS, (session_id,))
+        if not cursor.fetchone():
+            raise ValueError(f"Session {session_id} not found")
+
+    def _invalidate_history(self, session_id: Optional[str] = None) -> None:
+        """Drop cached histories for one session, or all of them."""
+        if session_id is None:
+            self._history_cache.clear()
+            return
+        for key in [k for k in self._history_cache if k[0] == session_id]:
+            del self._history_cache[key]
+
     def save_message(
         self,
         session_id: str,
@@ -155,35 +217,65 @@ class SessionStore:
         Raises:
             ValueError: If session doesn't exist
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Check if session exists
-        cursor.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,))
-        if not cursor.fetchone():
-            conn.close()
-            raise ValueError(f"Session {session_id} not found")
+        self._check_session(session_id)
 
         # Insert message
         now = datetime.utcnow().isoformat()
         metadata_json = json.dumps(metadata) if metadata else None
 
-        cursor.execute(
-            """INSERT INTO messages (session_id, role, content, timestamp, metadata)
-               VALUES (?, ?, ?, ?, ?)""",
-            (session_id, role, content, now, metadata_json)
+        self._conn.execute(
+            _SQL_INSERT_MESSAGE, (session_id, role, content, now, metadata_json)
         )
 
         # Update session last_active
-        cursor.execute(
-            "UPDATE sessions SET last_active = ? WHERE session_id = ?",
-            (now, session_id)
-        )
+        self._conn.execute(_SQL_TOUCH_SESSION, (now, session_id))
 
-        conn.commit()
-        conn.close()
+        self._conn.commit()
+        self._invalidate_history(session_id)
         logger.debug(f"Saved {role} message to session {session_id}")
 
+    def save_messages(
+        self,
+        session_id: str,
+        items: List[tuple]
+    ) -> None:
+        """
+        Save multiple messages to a session in a single transaction.
+
+        Batching amortizes the per-statement commit cost — useful when a
+        request saves the user and assistant messages together, or when
+        tests seed history.
+
+        Args:
+            session_id: Session ID
+            items: List of (role, content) or (role, content, metadata) tuples
+
+        Raises:
+            ValueError: If session doesn't exist
+        """
+        self._check_session(session_id)
+
+        now = datetime.utcnow().isoformat()
+        rows = [
+            (
+                session_id,
+                item[0],
+                item[1],
+                now,
+                json.dumps(item[2]) if len(item) > 2 and item[2] else None,
+            )
+            for item in items
+        ]
+
+        self._conn.executemany(_SQL_INSERT_MESSAGE, rows)
+
+        # Update session last_active once for the whole batch
+        self._conn.execute(_SQL_TOUCH_SESSION, (now, session_id))
+
+        self._conn.commit()
+        self._invalidate_history(session_id)
+        logger.debug(f"Saved {len(rows)} messages to session {session_id}")
+
     def get_history(self, session_id: str, limit: int = 10) -> List[Message]:
         """
         Get message history for a session.
@@ -198,27 +290,19 @@ class SessionStore:
         Raises:
             ValueError: If session doesn't exist
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Check if session exists
-        cursor.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,))
-        if not cursor.fetchone():
-            conn.close()
-            raise ValueError(f"Session {session_id} not found")
-
-        # Fetch messages (newest first, then reverse)
-        cursor.execute(
-            """SELECT role, content, timestamp, metadata
-               FROM messages
-               WHERE session_id = ?
-               ORDER BY timestamp DESC
-               LIMIT ?""",
-            (session_id, limit)
-        )
-
+        cache_key = (session_id, limit)
+        cached = self._history_cache.get(cache_key)
+        if cached is not None:
+            self._history_cache.move_to_end(cache_key)
+            # Shallow copy so callers can't mutate the cached list
+            return list(cached)
+
+        self._check_session(session_id)
+
+        # Fetch messages (newest first, then reverse). id breaks ties for
+        # batch-saved messages that share one timestamp.
+        cursor = self._conn.execute(_SQL_SELECT_HISTORY, (session_id, limit))
         rows = cursor.fetchall()
-        conn.close()
 
         # Convert to Message objects and reverse to get chronological order
         messages = []
@@ -228,11 +312,15 @@ class SessionStore:
             messages.append(Message(
                 role=role,
                 content=content,
-                timestamp=datetime.fromisoformat(timestamp),
+                timestamp=_fromiso(timestamp),
                 metadata=metadata
             ))
 
-        return messages
+        self._history_cache[cache_key] = messages
+        while len(self._history_cache) > self.HISTORY_CACHE_SIZE:
+            self._history_cache.popitem(last=False)
+
+        return list(messages)
 
     def list_sessions(self) -> List[SessionMeta]:
         """
@@ -241,31 +329,17 @@ class SessionStore:
         Returns:
             List of SessionMeta objects, ordered by last_active (most recent first)
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT s.session_id, s.created_at, s.last_active, COUNT(m.id) as msg_count
-            FROM sessions s
-            LEFT JOIN messages m ON s.session_id = m.session_id
-            GROUP BY s.session_id
-            ORDER BY s.last_active DESC
-        """)
-
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self._conn.execute(_SQL_LIST_SESSIONS).fetchall()
 
-        sessions = []
-        for row in rows:
-            session_id, created_at, last_active, msg_count = row
-            sessions.append(SessionMeta(
+        return [
+            SessionMeta(
                 session_id=session_id,
-                created_at=datetime.fromisoformat(created_at),
-                last_active=datetime.fromisoformat(last_active),
-                message_count=msg_count
-            ))
-
-        return sessions
+                created_at=_fromiso(created_at),
+                last_active=_fromiso(last_active),
+                message_count=msg_count,
+            )
+            for session_id, created_at, last_active, msg_count in rows
+        ]
 
     def delete_session(self, session_id: str) -> bool:
         """
@@ -277,14 +351,11 @@ class SessionStore:
         Returns:
             True if session was deleted, False if not found
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        cursor = self._conn.execute(_SQL_DELETE_SESSION, (session_id,))
         deleted = cursor.rowcount > 0
 
-        conn.commit()
-        conn.close()
+        self._conn.commit()
+        self._invalidate_history(session_id)
 
         if deleted:
             logger.info(f"Deleted session {session_id}")
@@ -306,17 +377,14 @@ class SessionStore:
         cutoff = datetime.utcnow() - timedelta(minutes=timeout_minutes)
         cutoff_iso = cutoff.isoformat()
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "DELETE FROM sessions WHERE last_active < ?",
-            (cutoff_iso,)
-        )
+        cursor = self._conn.execute(_SQL_DELETE_EXPIRED, (cutoff_iso,))
 
         deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
+        self._conn.commit()
+
+        if deleted_count:
+            # We don't know which sessions were removed — drop everything.
+            self._invalidate_history()
 
         if deleted_count > 0:
             logger.info(f"Cleaned up {deleted_count} expired sessions")
@@ -333,9 +401,5 @@ class SessionStore:
         Returns:
             True if session exists, False otherwise
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,))
-        exists = cursor.fetchone() is not None
-        conn.close()
-        return exists
+        cursor = self._conn.execute(_SQL_SESSION_EXISTS, (session_id,))
+        return cursor.fetchone() is not None
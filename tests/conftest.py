@@ -1,14 +1,31 @@
 """
 Pytest configuration and shared fixtures for Alfred tests.
 """
+import itertools
+import orjson
 import pytest
 import pytest_asyncio
+import sqlite3
 import tempfile
 import os
 from typing import AsyncGenerator
 from httpx import AsyncClient, ASGITransport
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _warm_app():
+    """
+    Import ai_server.main once per session (per xdist worker).
+
+    The import pulls in the FastAPI app, router, core and synthesizer
+    modules; paying that cost up front keeps it out of the first test's
+    runtime and out of every worker's first-collected module.
+    """
+    from ai_server.main import app
+
+    app.router.default  # touch to force any lazy router init
+
+
 @pytest.fixture
 def temp_db_path():
     """Provide a temporary database path for testing."""
@@ -22,38 +39,66 @@ def temp_db_path():
         os.remove(db_path)
 
 
+# Distinct name per fixture use so concurrent tests never share a database.
+# The pid component also separates pytest-xdist workers, which are processes.
+_mem_db_counter = itertools.count()
+
+
 @pytest.fixture
 def in_memory_db():
     """
-    Provide a temp file-based database for testing.
+    Provide a shared-cache in-memory SQLite database URI.
 
-    Note: We use a temp file instead of ":memory:" because each
-    connection to ":memory:" creates a separate database, which
-    doesn't work with SessionStore's connection-per-operation design.
+    mode=memory keeps the database entirely in RAM (no temp-file I/O,
+    no fsync), and cache=shared lets any extra connections (the keeper,
+    or a second store) see the same database. The keeper connection pins
+    the database alive for the test.
     """
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        db_path = f.name
+    name = f"alfred_test_{os.getpid()}_{next(_mem_db_counter)}"
+    uri = f"file:{name}?mode=memory&cache=shared"
+    keeper = sqlite3.connect(uri, uri=True)
 
-    yield db_path
+    yield uri
 
-    # Cleanup
-    if os.path.exists(db_path):
-        os.remove(db_path)
+    keeper.close()
+
+
+def rjson(response):
+    """Decode a response body with orjson (faster than stdlib json)."""
+    return orjson.loads(response.content)
+
+
+@pytest.fixture(scope="session")
+def call_execute():
+    """
+    Return a helper that awaits the /execute endpoint coroutine directly.
+
+    Bypasses routing, middleware and JSON (de)serialization — useful for
+    tests that only exercise handler logic. HTTPException propagates to
+    the caller instead of being rendered as a status code.
+    """
+    from ai_server.main import ExecuteRequest, execute_command
+
+    async def _call(user_input: str, **fields) -> dict:
+        return await execute_command(ExecuteRequest(user_input=user_input, **fields))
 
+    return _call
 
-@pytest_asyncio.fixture
-async def test_app():
-    """Provide a test FastAPI app instance."""
+
+@pytest_asyncio.fixture(scope="session")
+async def client() -> AsyncGenerator[AsyncClient, None]:
+    """
+    Session-scoped async HTTP client for FastAPI endpoint tests.
+
+    Building AsyncClient + ASGITransport re-walks the app's route and
+    middleware graph, which dominates per-test cost for fully mocked
+    handlers — so one client is shared across the whole run.
+    """
     # Import here to avoid circular imports
     from ai_server.main import app
-    return app
-
 
-@pytest_asyncio.fixture
-async def test_client(test_app) -> AsyncGenerator[AsyncClient, None]:
-    """Provide an async HTTP client for testing FastAPI endpoints."""
     async with AsyncClient(
-        transport=ASGITransport(app=test_app),
+        transport=ASGITransport(app=app),
         base_url="http://test"
-    ) as client:
-        yield client
+    ) as c:
+        yield c
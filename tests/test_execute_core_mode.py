@@ -14,11 +14,14 @@ These tests verify that the endpoint:
 
 All tests mock alfred_core — no Ollama required.
 """
+import asyncio
 import json
 import pytest
 import base64
-from unittest.mock import AsyncMock, MagicMock, patch
-from httpx import AsyncClient, ASGITransport
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from fastapi import HTTPException
 
 from ai_server.main import app
 from ai_server.alfred_router.schemas import CallToolDecision, ProposeNewToolDecision
@@ -30,7 +33,7 @@ from ai_server.models import CommandResponse
 # ---------------------------------------------------------------------------
 
 def _make_call_tool_decision(**params):
-    """Build a CallToolDecision for tests."""
+    """Build a CallToolDecision with custom parameters (rarely needed)."""
     return CallToolDecision(
         intent="call_tool",
         tool="home_assistant",
@@ -38,17 +41,8 @@ def _make_call_tool_decision(**params):
     )
 
 
-def _make_propose_decision():
-    """Build a ProposeNewToolDecision for tests."""
-    return ProposeNewToolDecision(
-        intent="propose_new_tool",
-        name="garage_control",
-        description="Control the garage door opener",
-    )
-
-
 def _make_command_response(message="Light turned on"):
-    """Build a CommandResponse mock."""
+    """Build a CommandResponse with a custom message."""
     return CommandResponse(
         status="success",
         action="turn_on",
@@ -57,16 +51,72 @@ def _make_command_response(message="Light turned on"):
     )
 
 
+#: Settings stand-in that puts the endpoint in Core mode. A plain namespace
+#: skips MagicMock's attribute-creation machinery on every settings access.
+CORE_SETTINGS = SimpleNamespace(alfred_mode="core")
+
+
+# Frozen model instances shared by tests that never mutate them — Pydantic
+# validation runs once at import instead of once per test.
+CALL_TOOL_DECISION = _make_call_tool_decision()
+PROPOSE_DECISION = ProposeNewToolDecision(
+    intent="propose_new_tool",
+    name="garage_control",
+    description="Control the garage door opener",
+)
+CMD_RESPONSE_BEDROOM_ON = _make_command_response("Bedroom light turned on")
+CMD_RESPONSE_LIGHTS_ON = _make_command_response("Lights are on")
+
+# Fake WAV payload and its base64 form, encoded once — asserts compare the
+# response string directly instead of round-tripping through b64decode.
+FAKE_WAV = b"RIFF" + b"\x00" * 40 + b"WAVE"
+FAKE_WAV_B64 = base64.b64encode(FAKE_WAV).decode()
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
+class _FakeCore:
+    """Minimal AlfredCore stand-in: only the coroutine method main.py calls.
+
+    A plain class with __slots__ skips MagicMock's attribute and spec
+    introspection on every access.
+    """
+    __slots__ = ("process",)
+
+    def __init__(self):
+        self.process = AsyncMock()
+
+
+@pytest.fixture(scope="module")
+def _shared_core():
+    """One fake AlfredCore per module."""
+    return _FakeCore()
+
+
 @pytest.fixture
-def mock_core():
-    """Return a mock AlfredCore with a coroutine process() method."""
-    core = MagicMock()
-    core.process = AsyncMock()
-    return core
+def mock_core(_shared_core):
+    """Hand out the shared mock AlfredCore, reset after each test."""
+    yield _shared_core
+    _shared_core.process.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture
+def core_mode(mock_core):
+    """
+    Patch ai_server.main into Core mode with the shared mock core.
+
+    One patch.multiple() call replaces the per-test stack of nested
+    patch() context managers; tests that need extra patches (synthesizer,
+    _handle_call_tool) layer just that one on top.
+    """
+    with patch.multiple(
+        "ai_server.main",
+        alfred_core=mock_core,
+        settings=CORE_SETTINGS,
+    ):
+        yield mock_core
 
 
 # ---------------------------------------------------------------------------
@@ -77,19 +127,14 @@ class TestCoreModeConversation:
     """Tests for plain text (conversation) responses from Core."""
 
     @pytest.mark.asyncio
-    async def test_core_conversation_response(self, mock_core):
+    async def test_core_conversation_response(self, core_mode, client):
         """Plain text Core output is returned as intent=conversation."""
-        mock_core.process.return_value = "I'm Alfred, your local AI assistant!"
+        core_mode.process.return_value = "I'm Alfred, your local AI assistant!"
 
-        with patch("ai_server.main.alfred_core", mock_core), \
-             patch("ai_server.main.settings") as mock_settings:
-            mock_settings.alfred_mode = "core"
-
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Who are you?"},
-                )
+        response = await client.post(
+            "/execute",
+            json={"user_input": "Who are you?"},
+        )
 
         assert response.status_code == 200
         data = response.json()
@@ -97,19 +142,14 @@ class TestCoreModeConversation:
         assert data["answer"] == "I'm Alfred, your local AI assistant!"
 
     @pytest.mark.asyncio
-    async def test_core_conversation_includes_session_id(self, mock_core):
+    async def test_core_conversation_includes_session_id(self, core_mode, client):
         """Conversation response always includes a session_id."""
-        mock_core.process.return_value = "Hello!"
-
-        with patch("ai_server.main.alfred_core", mock_core), \
-             patch("ai_server.main.settings") as mock_settings:
-            mock_settings.alfred_mode = "core"
+        core_mode.process.return_value = "Hello!"
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Hi"},
-                )
+        response = await client.post(
+            "/execute",
+            json={"user_input": "Hi"},
+        )
 
         assert response.status_code == 200
         data = response.json()
@@ -118,50 +158,60 @@ class TestCoreModeConversation:
         # (we're not mocking it here); just check the key exists
 
     @pytest.mark.asyncio
-    async def test_core_conversation_voice_mode_with_audio(self, mock_core):
+    async def test_core_conversation_voice_mode_with_audio(self, core_mode, client):
         """Conversation response in voice_mode includes audio_base64."""
-        mock_core.process.return_value = "Here is your answer."
-        fake_wav = b"RIFF" + b"\x00" * 40 + b"WAVE"
+        core_mode.process.return_value = "Here is your answer."
 
-        with patch("ai_server.main.alfred_core", mock_core), \
-             patch("ai_server.main.settings") as mock_settings, \
-             patch("ai_server.main.synthesizer") as mock_synth:
-            mock_settings.alfred_mode = "core"
-            mock_synth.synthesize = AsyncMock(return_value=fake_wav)
+        with patch("ai_server.main.synthesizer") as mock_synth:
+            mock_synth.synthesize = AsyncMock(return_value=FAKE_WAV)
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Tell me something", "voice_mode": True},
-                )
+            response = await client.post(
+                "/execute",
+                json={"user_input": "Tell me something", "voice_mode": True},
+            )
 
         assert response.status_code == 200
         data = response.json()
         assert data["intent"] == "conversation"
         assert "audio_base64" in data
-        assert base64.b64decode(data["audio_base64"]) == fake_wav
+        assert data["audio_base64"] == FAKE_WAV_B64
         mock_synth.synthesize.assert_called_once_with("Here is your answer.")
 
     @pytest.mark.asyncio
-    async def test_core_conversation_no_audio_when_voice_mode_false(self, mock_core):
+    async def test_core_conversation_no_audio_when_voice_mode_false(self, core_mode, client):
         """No audio_base64 when voice_mode is False."""
-        mock_core.process.return_value = "Hi there."
-
-        with patch("ai_server.main.alfred_core", mock_core), \
-             patch("ai_server.main.settings") as mock_settings:
-            mock_settings.alfred_mode = "core"
+        core_mode.process.return_value = "Hi there."
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Hello", "voice_mode": False},
-                )
+        response = await client.post(
+            "/execute",
+            json={"user_input": "Hello", "voice_mode": False},
+        )
 
         assert response.status_code == 200
         data = response.json()
         assert "audio_base64" not in data
 
 
+    @pytest.mark.asyncio
+    async def test_core_concurrent_conversation_requests(self, core_mode, client):
+        """Independent requests run concurrently under one patch context.
+
+        One asyncio.gather replaces a sequential request-per-test loop for
+        inputs that only differ in payload; the mock answers from the input
+        so the assertion stays deterministic regardless of completion order.
+        """
+        core_mode.process.side_effect = lambda user_input, **kwargs: f"echo: {user_input}"
+
+        inputs = ["Hi", "Who are you?", "Tell me a joke"]
+        responses = await asyncio.gather(
+            *(client.post("/execute", json={"user_input": text}) for text in inputs)
+        )
+
+        for text, response in zip(inputs, responses):
+            assert response.status_code == 200
+            assert response.json()["answer"] == f"echo: {text}"
+
+
 # ---------------------------------------------------------------------------
 # Core mode — CallToolDecision
 # ---------------------------------------------------------------------------
@@ -170,22 +220,16 @@ class TestCoreModeCallTool:
     """Tests for CallToolDecision path in Core mode."""
 
     @pytest.mark.asyncio
-    async def test_core_call_tool_dispatches_to_integration(self, mock_core):
+    async def test_core_call_tool_dispatches_to_integration(self, core_mode, client):
         """CallToolDecision from Core dispatches to the right integration."""
-        decision = _make_call_tool_decision()
-        mock_core.process.return_value = decision
-        mock_result = _make_command_response("Bedroom light turned on")
+        core_mode.process.return_value = CALL_TOOL_DECISION
 
-        with patch("ai_server.main.alfred_core", mock_core), \
-             patch("ai_server.main.settings") as mock_settings, \
-             patch("ai_server.main._handle_call_tool", new_callable=AsyncMock, return_value=mock_result):
-            mock_settings.alfred_mode = "core"
-
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Turn on the bedroom light"},
-                )
+        with patch("ai_server.main._handle_call_tool", new_callable=AsyncMock,
+                   return_value=CMD_RESPONSE_BEDROOM_ON):
+            response = await client.post(
+                "/execute",
+                json={"user_input": "Turn on the bedroom light"},
+            )
 
         assert response.status_code == 200
         data = response.json()
@@ -193,25 +237,19 @@ class TestCoreModeCallTool:
         assert data["message"] == "Bedroom light turned on"
 
     @pytest.mark.asyncio
-    async def test_core_call_tool_voice_mode_uses_result_message(self, mock_core):
+    async def test_core_call_tool_voice_mode_uses_result_message(self, core_mode, client):
         """In voice_mode, TTS is called with the CommandResponse message."""
-        decision = _make_call_tool_decision()
-        mock_core.process.return_value = decision
-        mock_result = _make_command_response("Lights are on")
-        fake_wav = b"RIFF....WAVE"
-
-        with patch("ai_server.main.alfred_core", mock_core), \
-             patch("ai_server.main.settings") as mock_settings, \
-             patch("ai_server.main._handle_call_tool", new_callable=AsyncMock, return_value=mock_result), \
+        core_mode.process.return_value = CALL_TOOL_DECISION
+
+        with patch("ai_server.main._handle_call_tool", new_callable=AsyncMock,
+                   return_value=CMD_RESPONSE_LIGHTS_ON), \
              patch("ai_server.main.synthesizer") as mock_synth:
-            mock_settings.alfred_mode = "core"
-            mock_synth.synthesize = AsyncMock(return_value=fake_wav)
+            mock_synth.synthesize = AsyncMock(return_value=FAKE_WAV)
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Turn on lights", "voice_mode": True},
-                )
+            response = await client.post(
+                "/execute",
+                json={"user_input": "Turn on lights", "voice_mode": True},
+            )
 
         assert response.status_code == 200
         data = response.json()
@@ -227,20 +265,14 @@ class TestCoreModePropose:
     """Tests for ProposeNewToolDecision path in Core mode."""
 
     @pytest.mark.asyncio
-    async def test_core_propose_new_tool_response(self, mock_core):
+    async def test_core_propose_new_tool_response(self, core_mode, client):
         """ProposeNewToolDecision returns the expected shape."""
-        decision = _make_propose_decision()
-        mock_core.process.return_value = decision
+        core_mode.process.return_value = PROPOSE_DECISION
 
-        with patch("ai_server.main.alfred_core", mock_core), \
-             patch("ai_server.main.settings") as mock_settings:
-            mock_settings.alfred_mode = "core"
-
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Add garage door control"},
-                )
+        response = await client.post(
+            "/execute",
+            json={"user_input": "Add garage door control"},
+        )
 
         assert response.status_code == 200
         data = response.json()
@@ -250,22 +282,17 @@ class TestCoreModePropose:
         assert data["executable"] is False
 
     @pytest.mark.asyncio
-    async def test_core_propose_includes_session_id(self, mock_core):
+    async def test_core_propose_includes_session_id(self, core_mode, client):
         """ProposeNewToolDecision response includes session_id."""
-        decision = _make_propose_decision()
-        mock_core.process.return_value = decision
-
-        with patch("ai_server.main.alfred_core", mock_core), \
-             patch("ai_server.main.settings") as mock_settings:
-            mock_settings.alfred_mode = "core"
+        core_mode.process.return_value = PROPOSE_DECISION
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Add garage door control"},
-                )
+        response = await client.post(
+            "/execute",
+            json={"user_input": "Add garage door control"},
+        )
 
-        assert "session_id" in response.json()
+        data = response.json()
+        assert "session_id" in data
 
 
 # ---------------------------------------------------------------------------
@@ -276,59 +303,43 @@ class TestCoreModeErrors:
     """Tests for error handling in Core mode."""
 
     @pytest.mark.asyncio
-    async def test_core_unavailable_returns_503(self):
-        """503 is returned when alfred_core is None."""
-        with patch("ai_server.main.alfred_core", None), \
-             patch("ai_server.main.settings") as mock_settings:
-            mock_settings.alfred_mode = "core"
-
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Hello"},
-                )
-
-        assert response.status_code == 503
-        assert "AlfredCore not available" in response.json()["detail"]
+    async def test_core_unavailable_returns_503(self, call_execute):
+        """503 is raised when alfred_core is None."""
+        with patch.multiple(
+            "ai_server.main",
+            alfred_core=None,
+            settings=CORE_SETTINGS,
+        ), pytest.raises(HTTPException) as exc_info:
+            await call_execute("Hello")
+
+        assert exc_info.value.status_code == 503
+        assert "AlfredCore not available" in exc_info.value.detail
 
     @pytest.mark.asyncio
-    async def test_core_value_error_returns_400(self, mock_core):
-        """ValueError from Core (e.g. malformed JSON retry failure) returns 400."""
-        mock_core.process.side_effect = ValueError("Core returned malformed JSON and retry failed")
-
-        with patch("ai_server.main.alfred_core", mock_core), \
-             patch("ai_server.main.settings") as mock_settings:
-            mock_settings.alfred_mode = "core"
+    async def test_core_value_error_returns_400(self, core_mode, call_execute):
+        """ValueError from Core (e.g. malformed JSON retry failure) raises 400."""
+        core_mode.process.side_effect = ValueError("Core returned malformed JSON and retry failed")
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Something that breaks the model"},
-                )
+        with pytest.raises(HTTPException) as exc_info:
+            await call_execute("Something that breaks the model")
 
-        assert response.status_code == 400
-        assert "malformed JSON" in response.json()["detail"]
+        assert exc_info.value.status_code == 400
+        assert "malformed JSON" in exc_info.value.detail
 
     @pytest.mark.asyncio
-    async def test_core_synthesis_error_does_not_fail_request(self, mock_core):
+    async def test_core_synthesis_error_does_not_fail_request(self, core_mode, client):
         """If TTS synthesis fails in voice_mode, request still succeeds without audio."""
-        mock_core.process.return_value = "Hello!"
+        core_mode.process.return_value = "Hello!"
 
-        with patch("ai_server.main.alfred_core", mock_core), \
-             patch("ai_server.main.settings") as mock_settings, \
-             patch("ai_server.main.synthesizer") as mock_synth:
-            mock_settings.alfred_mode = "core"
+        with patch("ai_server.main.synthesizer") as mock_synth:
             mock_synth.synthesize = AsyncMock(side_effect=RuntimeError("TTS model crashed"))
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "Hello", "voice_mode": True},
-                )
+            response = await client.post(
+                "/execute",
+                json={"user_input": "Hello", "voice_mode": True},
+            )
 
         assert response.status_code == 200
         data = response.json()
         assert data["answer"] == "Hello!"
         assert "audio_base64" not in data
-
-
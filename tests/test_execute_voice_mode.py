@@ -1,10 +1,14 @@
 """
 Unit tests for /execute endpoint with voice_mode support.
+
+These tests mock every async dependency, so they run on starlette's
+synchronous TestClient — no event-loop bridging per request.
 """
+import json
 import pytest
 import base64
 from unittest.mock import AsyncMock, patch
-from httpx import AsyncClient, ASGITransport
+from fastapi.testclient import TestClient
 from ai_server.main import app
 from ai_server.alfred_router.schemas import (
     CallToolDecision,
@@ -13,49 +17,48 @@ from ai_server.alfred_router.schemas import (
 from ai_server.models import CommandResponse
 
 
-class TestExecuteVoiceModeDisabled:
-    """Test /execute endpoint with voice_mode=False (default)."""
+# The same request body is posted by several tests; serialize it to bytes
+# once and send it as raw content instead of re-encoding via json= each time.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+WEATHER_VOICE_ON = json.dumps(
+    {"user_input": "What is the weather?", "voice_mode": True}
+).encode()
 
-    @pytest.mark.asyncio
-    async def test_execute_voice_mode_false_no_audio(self):
-        """Test execute with voice_mode=False doesn't include audio_base64."""
-        with patch('ai_server.main.alfred_core') as mock_core:
-            mock_core.process = AsyncMock(return_value="The weather today is sunny.")
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "What is the weather?", "voice_mode": False}
-                )
+@pytest.fixture(scope="module")
+def client():
+    """Module-scoped sync TestClient (overrides the async conftest client).
+
+    Instantiated without entering the context manager so the app's
+    lifespan (Ollama, Whisper, Piper) is never started.
+    """
+    return TestClient(app)
 
-            assert response.status_code == 200
-            data = response.json()
-            assert "answer" in data
-            assert data["answer"] == "The weather today is sunny."
-            assert "audio_base64" not in data  # No audio when voice_mode=False
 
-    @pytest.mark.asyncio
-    async def test_execute_default_no_voice_mode_no_audio(self):
-        """Test execute without voice_mode field (defaults to False)."""
+class TestExecuteVoiceModeDisabled:
+    """Test /execute endpoint with voice_mode=False (default)."""
+
+    @pytest.mark.parametrize("body", [
+        {"user_input": "What is the weather?", "voice_mode": False},
+        {"user_input": "What is the weather?"},  # No voice_mode field
+    ], ids=["explicit_false", "default"])
+    def test_execute_voice_mode_off_no_audio(self, client, body):
+        """No audio_base64 when voice_mode is False or omitted."""
         with patch('ai_server.main.alfred_core') as mock_core:
             mock_core.process = AsyncMock(return_value="The weather today is sunny.")
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/execute",
-                    json={"user_input": "What is the weather?"}  # No voice_mode field
-                )
+            response = client.post("/execute", json=body)
 
             assert response.status_code == 200
             data = response.json()
-            assert "audio_base64" not in data  # No audio by default
+            assert data["answer"] == "The weather today is sunny."
+            assert "audio_base64" not in data  # No audio when voice_mode is off
 
 
 class TestExecuteVoiceModeEnabled:
     """Test /execute endpoint with voice_mode=True."""
 
-    @pytest.mark.asyncio
-    async def test_execute_voice_mode_true_includes_audio(self):
+    def test_execute_voice_mode_true_includes_audio(self, client):
         """Test execute with voice_mode=True includes audio_base64."""
         with patch('ai_server.main.alfred_core') as mock_core:
             mock_core.process = AsyncMock(return_value="Test audio response")
@@ -65,11 +68,9 @@ class TestExecuteVoiceModeEnabled:
                 fake_wav = b'RIFF....WAVE....'  # Fake WAV bytes
                 mock_synth.synthesize = AsyncMock(return_value=fake_wav)
 
-                async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                    response = await client.post(
-                        "/execute",
-                        json={"user_input": "What is the weather?", "voice_mode": True}
-                    )
+                response = client.post(
+                    "/execute", content=WEATHER_VOICE_ON, headers=_JSON_HEADERS
+                )
 
                 assert response.status_code == 200
                 data = response.json()
@@ -84,19 +85,16 @@ class TestExecuteVoiceModeEnabled:
                 # Verify synthesizer was called with the response text
                 mock_synth.synthesize.assert_called_once_with("Test audio response")
 
-    @pytest.mark.asyncio
-    async def test_execute_voice_mode_no_synthesizer(self):
+    def test_execute_voice_mode_no_synthesizer(self, client):
         """Test execute with voice_mode=True gracefully handles missing synthesizer."""
         with patch('ai_server.main.alfred_core') as mock_core:
             mock_core.process = AsyncMock(return_value="Test answer")
 
             # Set synthesizer to None
             with patch('ai_server.main.synthesizer', None):
-                async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                    response = await client.post(
-                        "/execute",
-                        json={"user_input": "What is the weather?", "voice_mode": True}
-                    )
+                response = client.post(
+                    "/execute", content=WEATHER_VOICE_ON, headers=_JSON_HEADERS
+                )
 
                 # Should still succeed, just without audio
                 assert response.status_code == 200
@@ -104,8 +102,7 @@ class TestExecuteVoiceModeEnabled:
                 assert "answer" in data
                 assert "audio_base64" not in data  # No audio when synthesizer unavailable
 
-    @pytest.mark.asyncio
-    async def test_execute_voice_mode_synthesis_failure(self):
+    def test_execute_voice_mode_synthesis_failure(self, client):
         """Test execute with voice_mode=True handles synthesis errors gracefully."""
         with patch('ai_server.main.alfred_core') as mock_core:
             mock_core.process = AsyncMock(return_value="Test answer")
@@ -114,11 +111,9 @@ class TestExecuteVoiceModeEnabled:
             with patch('ai_server.main.synthesizer') as mock_synth:
                 mock_synth.synthesize = AsyncMock(side_effect=RuntimeError("Synthesis failed"))
 
-                async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                    response = await client.post(
-                        "/execute",
-                        json={"user_input": "What is the weather?", "voice_mode": True}
-                    )
+                response = client.post(
+                    "/execute", content=WEATHER_VOICE_ON, headers=_JSON_HEADERS
+                )
 
                 # Should still succeed, just without audio
                 assert response.status_code == 200
@@ -130,8 +125,7 @@ class TestExecuteVoiceModeEnabled:
 class TestExecuteVoiceModeWithTools:
     """Test /execute with voice_mode for CallToolDecision."""
 
-    @pytest.mark.asyncio
-    async def test_execute_voice_mode_with_tool_call(self):
+    def test_execute_voice_mode_with_tool_call(self, client):
         """Test voice_mode works with tool execution (CallToolDecision)."""
         decision = CallToolDecision(
             intent="call_tool",
@@ -160,11 +154,10 @@ class TestExecuteVoiceModeWithTools:
                     fake_wav = b'RIFF....WAVE....'
                     mock_synth.synthesize = AsyncMock(return_value=fake_wav)
 
-                    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                        response = await client.post(
-                            "/execute",
-                            json={"user_input": "Turn on the light", "voice_mode": True}
-                        )
+                    response = client.post(
+                        "/execute",
+                        json={"user_input": "Turn on the light", "voice_mode": True}
+                    )
 
                     assert response.status_code == 200
                     data = response.json()
@@ -177,18 +170,16 @@ class TestExecuteVoiceModeWithTools:
 class TestSynthesizeEndpoint:
     """Test standalone /synthesize endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_synthesize_endpoint_success(self):
+    def test_synthesize_endpoint_success(self, client):
         """Test /synthesize endpoint returns audio WAV."""
         with patch('ai_server.main.synthesizer') as mock_synth:
             fake_wav = b'RIFF' + b'\x00' * 40 + b'WAVE'  # Minimal WAV header
             mock_synth.synthesize = AsyncMock(return_value=fake_wav)
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/synthesize",
-                    json={"text": "Hello world"}
-                )
+            response = client.post(
+                "/synthesize",
+                json={"text": "Hello world"}
+            )
 
             assert response.status_code == 200
             assert response.headers["content-type"] == "audio/wav"
@@ -196,43 +187,37 @@ class TestSynthesizeEndpoint:
 
             mock_synth.synthesize.assert_called_once_with("Hello world")
 
-    @pytest.mark.asyncio
-    async def test_synthesize_endpoint_empty_text(self):
+    def test_synthesize_endpoint_empty_text(self, client):
         """Test /synthesize endpoint rejects empty text."""
         with patch('ai_server.main.synthesizer') as mock_synth:
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/synthesize",
-                    json={"text": ""}
-                )
+            response = client.post(
+                "/synthesize",
+                json={"text": ""}
+            )
 
             assert response.status_code == 400
             assert "empty" in response.json()["detail"].lower()
 
-    @pytest.mark.asyncio
-    async def test_synthesize_endpoint_no_synthesizer(self):
+    def test_synthesize_endpoint_no_synthesizer(self, client):
         """Test /synthesize endpoint returns 503 when synthesizer not available."""
         with patch('ai_server.main.synthesizer', None):
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/synthesize",
-                    json={"text": "Hello"}
-                )
+            response = client.post(
+                "/synthesize",
+                json={"text": "Hello"}
+            )
 
             assert response.status_code == 503
             assert "not initialized" in response.json()["detail"].lower()
 
-    @pytest.mark.asyncio
-    async def test_synthesize_endpoint_synthesis_failure(self):
+    def test_synthesize_endpoint_synthesis_failure(self, client):
         """Test /synthesize endpoint handles synthesis errors."""
         with patch('ai_server.main.synthesizer') as mock_synth:
             mock_synth.synthesize = AsyncMock(side_effect=RuntimeError("Model error"))
 
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/synthesize",
-                    json={"text": "Hello"}
-                )
+            response = client.post(
+                "/synthesize",
+                json={"text": "Hello"}
+            )
 
             assert response.status_code == 500
             assert "failed" in response.json()["detail"].lower()
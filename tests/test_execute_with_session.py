@@ -2,25 +2,62 @@
 Unit tests for /execute endpoint with session support.
 
 Note: These tests require the full FastAPI app with lifespan context,
-which initializes the router, Q/A handler, and session store.
+which initializes the core, audio pipeline, and session store.
 They are integration tests that verify the full request flow.
+
+The lifespan is entered exactly once per session with the heavy pieces
+swapped out: the session store runs on a temp-file SQLite DB, Whisper
+and Piper never load, and the LLM is a canned stub — so the tests cover
+real session plumbing without Ollama or model downloads.
 """
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
 import pytest
 import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import AsyncClient, ASGITransport
 from ai_server.main import app
 from ai_server import main as main_module
 
-
-@pytest_asyncio.fixture
-async def client():
-    """Provide an async HTTP client with app lifespan."""
-    from httpx import AsyncClient, ASGITransport
-
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test"
-    ) as ac:
-        yield ac
+from .conftest import rjson
+
+# ASGITransport is stateless, so one instance serves every client in the
+# module instead of being rebuilt per test.
+_TRANSPORT = ASGITransport(app=app)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(tmp_path_factory):
+    """Provide one async HTTP client with the app lifespan entered once.
+
+    The client (and the lifespan startup it implies) is built once per
+    session instead of once per test; tests only differ in payloads.
+    """
+    # One database per xdist worker (tmp_path_factory already gives each
+    # worker its own basetemp; the suffix makes the isolation explicit).
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    db_path = tmp_path_factory.mktemp("sessions") / f"test_sessions_{worker}.db"
+
+    with patch.object(main_module.settings, "session_db_path", str(db_path)), \
+         patch.object(main_module.settings, "tts_enabled", False), \
+         patch.object(main_module.HomeAssistantIntegration, "health_check",
+                      AsyncMock(return_value=False)), \
+         patch("ai_server.main.Transcriber"):
+        async with LifespanManager(app):
+            # Replace the Ollama-backed LLM with a canned stub so /execute
+            # exercises the full session path without a model server.
+            if main_module.alfred_core is not None:
+                main_module.alfred_core.llm = SimpleNamespace(
+                    invoke=lambda prompt: "Of course — noted."
+                )
+
+            async with AsyncClient(
+                transport=_TRANSPORT,
+                base_url="http://test"
+            ) as ac:
+                yield ac
 
 
 @pytest.mark.asyncio
@@ -39,7 +76,7 @@ async def test_execute_creates_session_if_none(client):
     assert response.status_code == 200
 
     # Should have session_id in response
-    data = response.json()
+    data = rjson(response)
     assert "session_id" in data
     assert isinstance(data["session_id"], str)
     assert len(data["session_id"]) == 36  # UUID format
@@ -56,7 +93,7 @@ async def test_execute_with_existing_session(client):
         "/execute",
         json={"user_input": "Hello"}
     )
-    session_id = response1.json()["session_id"]
+    session_id = rjson(response1)["session_id"]
 
     # Second request - use same session
     response2 = await client.post(
@@ -71,7 +108,7 @@ async def test_execute_with_existing_session(client):
     assert response2.status_code == 200
 
     # Should have same session_id
-    data = response2.json()
+    data = rjson(response2)
     assert data["session_id"] == session_id
 
 
@@ -87,7 +124,7 @@ async def test_execute_stores_messages(client):
         json={"user_input": "Hello Alfred"}
     )
 
-    session_id = response.json()["session_id"]
+    session_id = rjson(response)["session_id"]
 
     # Get session history
     history = main_module.session_store.get_history(session_id)
@@ -125,7 +162,7 @@ async def test_execute_with_invalid_session_creates_new(client):
     assert response.status_code == 200
 
     # Should have a different (new) session_id
-    data = response.json()
+    data = rjson(response)
     assert "session_id" in data
     assert data["session_id"] != fake_session
 
@@ -138,7 +175,7 @@ async def test_session_list_endpoint(client):
     assert response.status_code in [200, 503]  # 503 if store not available
 
     if response.status_code == 200:
-        data = response.json()
+        data = rjson(response)
         assert "count" in data
         assert "sessions" in data
         assert isinstance(data["sessions"], list)
@@ -152,7 +189,7 @@ async def test_session_create_endpoint(client):
     assert response.status_code in [200, 503]
 
     if response.status_code == 200:
-        data = response.json()
+        data = rjson(response)
         assert "session_id" in data
         assert len(data["session_id"]) == 36
 
@@ -172,7 +209,7 @@ async def test_session_get_endpoint(client):
     response = await client.get(f"/sessions/{session_id}")
 
     assert response.status_code == 200
-    data = response.json()
+    data = rjson(response)
 
     assert "session" in data
     assert "messages" in data
@@ -193,7 +230,7 @@ async def test_session_delete_endpoint(client):
     response = await client.delete(f"/sessions/{session_id}")
 
     assert response.status_code == 200
-    data = response.json()
+    data = rjson(response)
     assert data["status"] == "success"
 
     # Session should no longer exist
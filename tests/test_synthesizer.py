@@ -6,7 +6,7 @@ import wave
 import io
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
-from ai_server.audio.synthesizer import Synthesizer
+from ai_server.audio.synthesizer import Synthesizer, _voice_model_exists
 
 
 class TestSynthesizerInit:
@@ -30,6 +30,13 @@ class TestSynthesizerInit:
 class TestSynthesizerLoadModel:
     """Test Synthesizer model loading."""
 
+    @pytest.fixture(autouse=True)
+    def _fresh_path_cache(self):
+        """Reset the model-existence cache so patched Path.exists is seen."""
+        _voice_model_exists.cache_clear()
+        yield
+        _voice_model_exists.cache_clear()
+
     def test_load_model_file_not_found(self):
         """Test load_model raises FileNotFoundError if voice model doesn't exist."""
         synth = Synthesizer(voice_model="nonexistent/voice.onnx")
@@ -45,14 +52,131 @@ class TestSynthesizerLoadModel:
             mock_piper_class = Mock()
             mock_piper_class.load = Mock(return_value=mock_voice_instance)
 
-            # Mock the import of piper module
-            with patch.dict('sys.modules', {'piper': Mock(PiperVoice=mock_piper_class)}):
+            # Mock the imports of piper and onnxruntime
+            mock_ort = MagicMock()
+            modules = {
+                'piper': Mock(PiperVoice=mock_piper_class),
+                'onnxruntime': mock_ort,
+            }
+            with patch.dict('sys.modules', modules):
                 synth = Synthesizer(voice_model="test_voice.onnx")
                 synth.load_model()
 
                 assert synth.voice == mock_voice_instance
                 mock_piper_class.load.assert_called_once_with("test_voice.onnx", use_cuda=False)
 
+    def test_load_model_configures_ort_session(self):
+        """Test load_model rebuilds the ONNX session with optimized options."""
+        with patch('ai_server.audio.synthesizer.Path.exists', return_value=True):
+            mock_voice_instance = Mock()
+            mock_piper_class = Mock()
+            mock_piper_class.load = Mock(return_value=mock_voice_instance)
+
+            mock_ort = MagicMock()
+            modules = {
+                'piper': Mock(PiperVoice=mock_piper_class),
+                'onnxruntime': mock_ort,
+            }
+            with patch.dict('sys.modules', modules):
+                synth = Synthesizer(voice_model="test_voice.onnx")
+                synth.load_model()
+
+                # Session options carry full graph optimization
+                so = mock_ort.SessionOptions.return_value
+                assert so.graph_optimization_level == \
+                    mock_ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                assert so.execution_mode == mock_ort.ExecutionMode.ORT_SEQUENTIAL
+
+                # The voice's session was replaced with the tuned one
+                mock_ort.InferenceSession.assert_called_once_with(
+                    "test_voice.onnx",
+                    sess_options=so,
+                    providers=["CPUExecutionProvider"],
+                )
+                assert synth.voice.session == mock_ort.InferenceSession.return_value
+
+    def test_load_model_cuda_providers(self):
+        """Test use_cuda=True selects CUDA with non-exhaustive algo search."""
+        with patch('ai_server.audio.synthesizer.Path.exists', return_value=True):
+            mock_piper_class = Mock()
+            mock_piper_class.load = Mock(return_value=Mock())
+
+            mock_ort = MagicMock()
+            modules = {
+                'piper': Mock(PiperVoice=mock_piper_class),
+                'onnxruntime': mock_ort,
+            }
+            with patch.dict('sys.modules', modules):
+                synth = Synthesizer(voice_model="test_voice.onnx", use_cuda=True)
+                synth.load_model()
+
+                providers = mock_ort.InferenceSession.call_args.kwargs["providers"]
+                assert providers[0] == (
+                    "CUDAExecutionProvider",
+                    {
+                        "cudnn_conv_algo_search": "DEFAULT",
+                        "do_copy_in_default_stream": True,
+                    },
+                )
+                assert providers[1] == "CPUExecutionProvider"
+
+    def test_load_model_quantize_uses_int8_session(self):
+        """Test quantize=True builds the session from the INT8 model."""
+        with patch('ai_server.audio.synthesizer.Path.exists', return_value=True):
+            mock_piper_class = Mock()
+            mock_piper_class.load = Mock(return_value=Mock())
+
+            mock_ort = MagicMock()
+            modules = {
+                'piper': Mock(PiperVoice=mock_piper_class),
+                'onnxruntime': mock_ort,
+            }
+            with patch.dict('sys.modules', modules), \
+                 patch.object(Synthesizer, '_maybe_quantize',
+                              return_value="test_voice.int8.onnx") as mock_quant:
+                synth = Synthesizer(voice_model="test_voice.onnx", quantize=True)
+                synth.load_model()
+
+                mock_quant.assert_called_once_with("test_voice.onnx")
+                assert mock_ort.InferenceSession.call_args.args[0] == \
+                    "test_voice.int8.onnx"
+
+    def test_voice_model_exists_is_cached(self, tmp_path):
+        """Test _voice_model_exists caches stat results per path."""
+        model = tmp_path / "cached_voice.onnx"
+        model.write_bytes(b"fake onnx model")
+
+        assert _voice_model_exists(str(model)) is True
+
+        # Removal is not observed until the cache is cleared
+        model.unlink()
+        assert _voice_model_exists(str(model)) is True
+
+        _voice_model_exists.cache_clear()
+        assert _voice_model_exists(str(model)) is False
+
+    def test_maybe_quantize_caches_by_mtime(self, tmp_path):
+        """Test _maybe_quantize writes the INT8 model once and reuses it."""
+        src = tmp_path / "voice.onnx"
+        src.write_bytes(b"fake onnx model")
+        quant = tmp_path / "voice.int8.onnx"
+
+        mock_quantize = Mock(side_effect=lambda s, q, **kw: Path(q).write_bytes(b"int8"))
+        quant_module = Mock(quantize_dynamic=mock_quantize, QuantType=Mock())
+
+        with patch.dict('sys.modules', {'onnxruntime.quantization': quant_module}):
+            synth = Synthesizer(voice_model=str(src), quantize=True)
+
+            # First call quantizes
+            result = synth._maybe_quantize(str(src))
+            assert result == str(quant)
+            assert mock_quantize.call_count == 1
+
+            # Second call hits the mtime cache
+            result = synth._maybe_quantize(str(src))
+            assert result == str(quant)
+            assert mock_quantize.call_count == 1
+
     @patch('ai_server.audio.synthesizer.Path.exists')
     def test_load_model_import_error(self, mock_exists):
         """Test load_model raises ImportError if piper-tts not installed."""
@@ -68,20 +192,22 @@ class TestSynthesizerLoadModel:
 class TestSynthesizerSynthesize:
     """Test Synthesizer synthesis functionality."""
 
-    def setup_method(self):
-        """Set up a mock synthesizer for each test."""
-        self.synth = Synthesizer(voice_model="test_voice.onnx")
-        self.synth.voice = Mock()
+    @pytest.fixture
+    def mock_synth(self):
+        """Provide a synthesizer with a mocked voice model."""
+        synth = Synthesizer(voice_model="test_voice.onnx")
+        synth.voice = Mock()
+        return synth
 
-    def test_synthesize_sync_returns_wav_bytes(self):
+    def test_synthesize_sync_returns_wav_bytes(self, mock_synth):
         """Test synthesize_sync returns valid WAV bytes."""
         # Mock the voice synthesis to return an iterable of audio chunks
         mock_chunk = Mock()
         mock_chunk.audio_int16_bytes = b'\x00\x01' * 100  # Fake PCM samples
         mock_chunk.sample_rate = 22050
-        self.synth.voice.synthesize.return_value = iter([mock_chunk])
+        mock_synth.voice.synthesize.return_value = [mock_chunk]
 
-        wav_bytes = self.synth.synthesize_sync("Hello world")
+        wav_bytes = mock_synth.synthesize_sync("Hello world")
 
         # Check that we got bytes back
         assert isinstance(wav_bytes, bytes)
@@ -94,11 +220,54 @@ class TestSynthesizerSynthesize:
             assert wav_file.getsampwidth() == 2  # 16-bit
             assert wav_file.getframerate() == 22050  # 22050 Hz
 
-        self.synth.voice.synthesize.assert_called_once_with("Hello world", syn_config=None)
+        mock_synth.voice.synthesize.assert_called_once_with("Hello world", syn_config=None)
 
-    def test_synthesize_sync_empty_text(self):
+    def test_synthesize_sync_strips_padding(self, mock_synth):
+        """Test surrounding whitespace is stripped before reaching Piper."""
+        mock_chunk = Mock()
+        mock_chunk.audio_int16_bytes = b'\x00\x01' * 100
+        mock_chunk.sample_rate = 22050
+        mock_synth.voice.synthesize.return_value = [mock_chunk]
+
+        mock_synth.synthesize_sync("  Hello world \n")
+
+        mock_synth.voice.synthesize.assert_called_once_with(
+            "Hello world", syn_config=None
+        )
+
+    def test_synthesize_sync_custom_sample_rate(self, mock_synth):
+        """Test output_sample_rate resamples the PCM and updates the header."""
+        mock_synth.output_sample_rate = 16000
+        mock_chunk = Mock()
+        mock_chunk.audio_int16_bytes = b'\x00\x01' * 100
+        mock_chunk.sample_rate = 22050
+        mock_synth.voice.synthesize.return_value = [mock_chunk]
+
+        wav_bytes = mock_synth.synthesize_sync("Hello world")
+
+        with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+            assert wav_file.getframerate() == 16000
+            # 100 samples at 22050 Hz resample to 72 at 16000 Hz
+            assert wav_file.getnframes() == 72
+
+    def test_synthesize_sync_zero_copy(self, mock_synth):
+        """Test zero_copy=True returns a memoryview over the same WAV data."""
+        mock_chunk = Mock()
+        mock_chunk.audio_int16_bytes = b'\x00\x01' * 100
+        mock_chunk.sample_rate = 22050
+        mock_synth.voice.synthesize.return_value = [mock_chunk]
+
+        wav_view = mock_synth.synthesize_sync("Hello world", zero_copy=True)
+
+        assert isinstance(wav_view, memoryview)
+        with wave.open(io.BytesIO(bytes(wav_view)), 'rb') as wav_file:
+            assert wav_file.getnchannels() == 1
+            assert wav_file.getframerate() == 22050
+            assert wav_file.getnframes() == 100
+
+    def test_synthesize_sync_empty_text(self, mock_synth):
         """Test synthesize_sync handles empty text gracefully."""
-        wav_bytes = self.synth.synthesize_sync("")
+        wav_bytes = mock_synth.synthesize_sync("")
 
         # Should return a silent WAV (valid but empty)
         assert isinstance(wav_bytes, bytes)
@@ -112,9 +281,9 @@ class TestSynthesizerSynthesize:
             assert wav_file.getframerate() == 22050
             assert wav_file.getnframes() == 0  # No audio frames
 
-    def test_synthesize_sync_whitespace_text(self):
+    def test_synthesize_sync_whitespace_text(self, mock_synth):
         """Test synthesize_sync handles whitespace-only text gracefully."""
-        wav_bytes = self.synth.synthesize_sync("   \n  \t  ")
+        wav_bytes = mock_synth.synthesize_sync("   \n  \t  ")
 
         # Should return a silent WAV
         assert isinstance(wav_bytes, bytes)
@@ -131,32 +300,32 @@ class TestSynthesizerSynthesize:
             synth.synthesize_sync("test")
         assert "not loaded" in str(exc_info.value)
 
-    def test_synthesize_sync_with_speaker_id(self):
+    def test_synthesize_sync_with_speaker_id(self, mock_synth):
         """Test synthesize_sync passes speaker_id via SynthesisConfig to voice model."""
-        self.synth.speaker_id = 2
+        mock_synth.speaker_id = 2
         mock_chunk = Mock()
         mock_chunk.audio_int16_bytes = b'\x00\x01' * 100
         mock_chunk.sample_rate = 22050
-        self.synth.voice.synthesize.return_value = iter([mock_chunk])
+        mock_synth.voice.synthesize.return_value = [mock_chunk]
 
-        self.synth.synthesize_sync("Hello")
+        mock_synth.synthesize_sync("Hello")
 
         # speaker_id is passed via a SynthesisConfig object, not as a kwarg directly
-        self.synth.voice.synthesize.assert_called_once()
-        call_kwargs = self.synth.voice.synthesize.call_args
+        mock_synth.voice.synthesize.assert_called_once()
+        call_kwargs = mock_synth.voice.synthesize.call_args
         assert call_kwargs.args[0] == "Hello"
         assert call_kwargs.kwargs["syn_config"] is not None
 
     @pytest.mark.asyncio
-    async def test_synthesize_async_wrapper(self):
+    async def test_synthesize_async_wrapper(self, mock_synth):
         """Test synthesize async wrapper works correctly."""
         # Mock the voice synthesis to return an iterable of audio chunks
         mock_chunk = Mock()
         mock_chunk.audio_int16_bytes = b'\x00\x01' * 100
         mock_chunk.sample_rate = 22050
-        self.synth.voice.synthesize.return_value = iter([mock_chunk])
+        mock_synth.voice.synthesize.return_value = [mock_chunk]
 
-        wav_bytes = await self.synth.synthesize("Async test")
+        wav_bytes = await mock_synth.synthesize("Async test")
 
         # Verify we got valid WAV bytes
         assert isinstance(wav_bytes, bytes)
@@ -167,6 +336,183 @@ class TestSynthesizerSynthesize:
             assert wav_file.getnchannels() == 1
 
 
+class TestSynthesizerBatch:
+    """Test Synthesizer batch synthesis."""
+
+    @pytest.fixture
+    def mock_synth(self):
+        """Provide a synthesizer with a mocked voice model."""
+        synth = Synthesizer(voice_model="test_voice.onnx")
+        synth.voice = Mock()
+        return synth
+
+    def test_synthesize_batch_sync_returns_wav_per_text(self, mock_synth):
+        """Test synthesize_batch_sync returns one WAV per input text."""
+        def _make_chunks(text, syn_config=None):
+            chunk = Mock()
+            chunk.audio_int16_bytes = b'\x00\x01' * 100
+            chunk.sample_rate = 22050
+            return [chunk]
+
+        mock_synth.voice.synthesize.side_effect = _make_chunks
+
+        results = mock_synth.synthesize_batch_sync(["Hello", "World"])
+
+        assert len(results) == 2
+        for wav_bytes in results:
+            with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+                assert wav_file.getnchannels() == 1
+                assert wav_file.getnframes() == 100
+        assert mock_synth.voice.synthesize.call_count == 2
+
+    def test_synthesize_batch_sync_model_not_loaded(self):
+        """Test synthesize_batch_sync raises error if model not loaded."""
+        synth = Synthesizer()
+
+        with pytest.raises(RuntimeError) as exc_info:
+            synth.synthesize_batch_sync(["test"])
+        assert "not loaded" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_synthesize_batch_async_wrapper(self, mock_synth):
+        """Test synthesize_batch async wrapper works correctly."""
+        def _make_chunks(text, syn_config=None):
+            chunk = Mock()
+            chunk.audio_int16_bytes = b'\x00\x01' * 100
+            chunk.sample_rate = 22050
+            return [chunk]
+
+        mock_synth.voice.synthesize.side_effect = _make_chunks
+
+        results = await mock_synth.synthesize_batch(["One", "Two", "Three"])
+
+        assert len(results) == 3
+        assert all(isinstance(wav, bytes) for wav in results)
+
+    @pytest.mark.asyncio
+    async def test_synthesize_batch_empty_list(self, mock_synth):
+        """Test synthesize_batch returns an empty list without dispatching."""
+        results = await mock_synth.synthesize_batch([])
+
+        assert results == []
+        mock_synth.voice.synthesize.assert_not_called()
+
+
+class TestSynthesizerStream:
+    """Test Synthesizer streaming synthesis."""
+
+    @pytest.fixture
+    def mock_synth(self):
+        """Provide a synthesizer with a mocked voice model."""
+        synth = Synthesizer(voice_model="test_voice.onnx")
+        synth.voice = Mock()
+        return synth
+
+    def test_synthesize_stream_sync_yields_header_then_pcm(self, mock_synth):
+        """Test synthesize_stream_sync yields a WAV header then raw PCM chunks."""
+        mock_chunk = Mock()
+        mock_chunk.audio_int16_bytes = b'\x00\x01' * 100
+        mock_chunk.sample_rate = 22050
+        mock_synth.voice.synthesize.return_value = [mock_chunk]
+
+        parts = list(mock_synth.synthesize_stream_sync("Hello world"))
+
+        # First fragment is the 44-byte header, rest is raw PCM
+        assert len(parts[0]) == 44
+        assert parts[0][:4] == b'RIFF'
+        assert parts[0][8:12] == b'WAVE'
+        assert b''.join(parts[1:]) == b'\x00\x01' * 100
+
+    def test_synthesize_stream_sync_reassembles_to_valid_wav(self, mock_synth):
+        """Test the stream reassembles to a parseable WAV once sizes are patched."""
+        mock_chunk = Mock()
+        mock_chunk.audio_int16_bytes = b'\x00\x01' * 100
+        mock_chunk.sample_rate = 22050
+        mock_synth.voice.synthesize.return_value = [mock_chunk]
+
+        parts = list(mock_synth.synthesize_stream_sync("Hello world"))
+        pcm = b''.join(parts[1:])
+
+        # Streaming headers carry 0xFFFFFFFF sizes; patch them with the
+        # now-known data length before handing to the wave parser.
+        import struct
+        header = bytearray(parts[0])
+        struct.pack_into('<I', header, 4, 36 + len(pcm))
+        struct.pack_into('<I', header, 40, len(pcm))
+
+        with wave.open(io.BytesIO(bytes(header) + pcm), 'rb') as wav_file:
+            assert wav_file.getnchannels() == 1
+            assert wav_file.getsampwidth() == 2
+            assert wav_file.getframerate() == 22050
+            assert wav_file.getnframes() == 100
+
+    def test_synthesize_stream_sync_empty_text(self, mock_synth):
+        """Test synthesize_stream_sync yields a silent WAV for empty text."""
+        parts = list(mock_synth.synthesize_stream_sync(""))
+
+        assert len(parts) == 1
+        with wave.open(io.BytesIO(parts[0]), 'rb') as wav_file:
+            assert wav_file.getnframes() == 0
+
+    def test_synthesize_stream_sync_model_not_loaded(self):
+        """Test synthesize_stream_sync raises error if model not loaded."""
+        synth = Synthesizer()
+
+        with pytest.raises(RuntimeError) as exc_info:
+            list(synth.synthesize_stream_sync("test"))
+        assert "not loaded" in str(exc_info.value)
+
+
+class TestPcmHelpers:
+    """Test PCM post-processing helpers."""
+
+    def test_apply_fade_preserves_length(self):
+        """Test apply_fade keeps the sample count unchanged."""
+        import numpy as np
+        from ai_server.audio._pcm import apply_fade
+
+        pcm = np.full(1000, 10000, dtype=np.int16)
+        result = apply_fade(pcm, 100)
+
+        assert len(result) == 1000
+        assert result.dtype == np.int16
+        # Edges are silenced, middle untouched
+        assert result[0] == 0
+        assert result[-1] == 0
+        assert result[500] == 10000
+
+    def test_apply_fade_clamps_to_half_signal(self):
+        """Test fades longer than half the signal do not overlap."""
+        import numpy as np
+        from ai_server.audio._pcm import apply_fade
+
+        pcm = np.full(10, 10000, dtype=np.int16)
+        result = apply_fade(pcm, 100)
+
+        assert len(result) == 10
+        assert result[0] == 0 and result[-1] == 0
+
+    def test_synthesize_sync_applies_fade(self):
+        """Test fade_ms fades the utterance edges without changing length."""
+        import numpy as np
+
+        synth = Synthesizer(voice_model="test_voice.onnx", fade_ms=2)
+        synth.voice = Mock()
+        mock_chunk = Mock()
+        mock_chunk.audio_int16_bytes = np.full(1000, 10000, np.int16).tobytes()
+        mock_chunk.sample_rate = 22050
+        synth.voice.synthesize.return_value = [mock_chunk]
+
+        wav_bytes = synth.synthesize_sync("Hello world")
+
+        with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+            assert wav_file.getnframes() == 1000
+            samples = np.frombuffer(wav_file.readframes(1000), np.int16)
+        assert samples[0] == 0
+        assert samples[-1] == 0
+        assert samples[500] == 10000
+
+
 class TestSynthesizerPrivateMethods:
     """Test Synthesizer private helper methods."""
 